@@ -1,20 +1,42 @@
 from __future__ import annotations
 
+import concurrent.futures
 import dataclasses
+import functools
 import itertools
 import logging
 import math
+import os
 import pathlib
 import re
 from typing import Any, Generator, Literal, Optional, Tuple, TypedDict
 
+import ijson
 import jsonschema
 
-from ._json import load_json, save_json
+from ._json import load_json, save_json, validate_json
+from .exceptions import BackupLoadError
 
 PageOrder = Literal["as-is", "created-asc", "created-desc"]
 InternalLinkType = Literal["page", "word"]
 
+# regex
+_EXTERNAL_URL_RE = re.compile(r"https?://[^\s\]]+")
+_CODE_BLOCK_RE = re.compile(r"(?P<indent>(\t| )*)code:.+")
+_CLI_NOTATION_RE = re.compile(r"(\t| )*(\$|%) .+")
+_CODE_SNIPPETS_RE = re.compile(r"`.*?`")
+_TIMESTAMP_DIRECTORY_RE = re.compile(r"[0-9]+")
+
+# translation table to escape filename
+_FILENAME_TRANSLATE = str.maketrans(
+    {
+        " ": "_",
+        "#": "%23",
+        "%": "%25",
+        "/": "%2F",
+    }
+)
+
 
 class BackupInfoJSON(TypedDict):
     id: str
@@ -23,6 +45,7 @@ class BackupInfoJSON(TypedDict):
     totalLinks: int
 
 
+@functools.cache
 def jsonschema_backup_info() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -45,6 +68,7 @@ class UserJSON(TypedDict):
     email: str
 
 
+@functools.cache
 def jsonschema_user() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -66,6 +90,7 @@ class BackupPageLineJSON(TypedDict):
     updated: int
 
 
+@functools.cache
 def jsonschema_backup_page_line() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -92,14 +117,19 @@ class BackupPageJSON(TypedDict):
 
 
 def page_lines(page: BackupPageJSON) -> Generator[str, None, None]:
-    for line in page["lines"]:
-        match line:
-            case str():
-                yield line
-            case {"text": text}:
-                yield text
-
-
+    lines = page["lines"]
+    if not lines:
+        return
+    # all lines have the same type (JSON Schema: oneOf)
+    if isinstance(lines[0], str):
+        yield from lines
+    else:
+        for line in lines:
+            if "text" in line:
+                yield line["text"]
+
+
+@functools.cache
 def jsonschema_backup_page() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -140,6 +170,7 @@ class BackupJSON(TypedDict):
     pages: list[BackupPageJSON]
 
 
+@functools.cache
 def jsonschema_backup() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -162,12 +193,13 @@ def jsonschema_backup() -> dict[str, Any]:
     return schema
 
 
-@dataclasses.dataclass(order=True)
+@dataclasses.dataclass(order=True, slots=True)
 class Location:
     title: str
     line: int
 
 
+@functools.cache
 def jsonschema_location() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -181,25 +213,25 @@ def jsonschema_location() -> dict[str, Any]:
     return schema
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class InternalLinkNode:
     name: str
     type: InternalLinkType
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class InternalLink:
     node: InternalLinkNode
     to_links: list[InternalLinkNode]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ExternalLink:
     url: str
     locations: list[Location]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class UpdateDiff:
     added: list[pathlib.Path]
     updated: list[pathlib.Path]
@@ -222,18 +254,13 @@ class Backup:
         self._backup = backup
         self._info = info
         self._page_order = page_order
+        self._escaped_pages: Optional[dict[str, BackupPageJSON]] = None
         # sort pages
         _sort_pages(self._backup["pages"], self._page_order)
         # JSON Schema validation
-        jsonschema.validate(
-            instance=self._backup,
-            schema=jsonschema_backup(),
-        )
+        validate_json(self._backup, jsonschema_backup())
         if self._info is not None:
-            jsonschema.validate(
-                instance=self._info,
-                schema=jsonschema_backup_info(),
-            )
+            validate_json(self._info, jsonschema_backup_info())
 
     @property
     def project(self) -> str:
@@ -260,22 +287,22 @@ class Backup:
 
     def internal_links(self) -> list[InternalLink]:
         # page
-        pages = {_normalize_page_title(page): page for page in self.page_titles()}
+        pages = {
+            _normalize_page_title(page["title"]): page["title"]
+            for page in self._backup["pages"]
+        }
         # links
         links: list[InternalLink] = []
         for page in self._backup["pages"]:
-            to_links = sorted(
-                (
-                    InternalLinkNode(
-                        name=pages.get(link, link),
-                        type=(
-                            "page" if _normalize_page_title(link) in pages else "word"
-                        ),
-                    )
-                    for link in page["linksLc"]
-                ),
-                key=lambda node: node.name,
-            )
+            to_links: list[InternalLinkNode] = []
+            for link in page["linksLc"]:
+                title = pages.get(_normalize_page_title(link))
+                to_links.append(
+                    InternalLinkNode(name=title, type="page")
+                    if title is not None
+                    else InternalLinkNode(name=link, type="word")
+                )
+            to_links.sort(key=lambda node: node.name)
             links.append(
                 InternalLink(
                     node=InternalLinkNode(name=page["title"], type="page"),
@@ -286,23 +313,23 @@ class Backup:
         return links
 
     def external_links(self) -> list[ExternalLink]:
-        # regex
-        regex = re.compile(r"https?://[^\s\]]+")
         # links
-        links: list[ExternalLink] = []
+        links: dict[str, ExternalLink] = {}
         for page in self._backup["pages"]:
             for line, location in _filter_code(page):
-                for url in regex.findall(line):
-                    found = next((link for link in links if link.url == url), None)
-                    if found is not None:
-                        found.locations.append(location)
-                    else:
-                        links.append(ExternalLink(url=url, locations=[location]))
+                # skip lines without URL
+                if "http" not in line:
+                    continue
+                for url_match in _EXTERNAL_URL_RE.finditer(line):
+                    url = url_match.group()
+                    link = links.get(url)
+                    if link is None:
+                        link = links[url] = ExternalLink(url=url, locations=[])
+                    link.locations.append(location)
         # sort
-        links.sort(key=lambda link: link.url)
-        for link in links:
+        for link in links.values():
             link.locations.sort()
-        return links
+        return sorted(links.values(), key=lambda link: link.url)
 
     def update(
         self,
@@ -318,7 +345,7 @@ class Backup:
         # sort pages
         _sort_pages(backup["pages"], self._page_order)
         # backup
-        backup_path = self.directory.joinpath(f"{_escape_filename(self.project)}.json")
+        backup_path = _backup_path(self.directory, self.project)
         if backup != self._backup:
             logger.debug(f'update "{backup_path}"')
             save_json(backup_path, backup)
@@ -339,14 +366,13 @@ class Backup:
                 save_json(info_path, info)
                 updated.append(info_path)
         # previous pages
-        previous_pages = {
-            _escape_filename(page["title"]): page for page in self._backup["pages"]
-        }
+        previous_pages = self._pages().copy()
         # add/update pages
-        page_directory = self.directory.joinpath("pages")
+        pages: dict[str, BackupPageJSON] = {}
         for page in backup["pages"]:
             title = _escape_filename(page["title"])
-            page_path = page_directory.joinpath(f"{title}.json")
+            pages[title] = page
+            page_path = self._page_path(title)
             if title in previous_pages:
                 if page != previous_pages[title]:
                     # update page
@@ -362,29 +388,26 @@ class Backup:
                 added.append(page_path)
         # remove deleted pages
         for title in previous_pages.keys():
-            page_path = page_directory.joinpath(f"{title}.json")
+            page_path = self._page_path(title)
             logger.debug(f'remove "{page_path}"')
             page_path.unlink()
             removed.append(page_path)
         # update self
         self._backup = backup
         self._info = info
+        self._escaped_pages = pages
         return UpdateDiff(added, updated, removed)
 
     def save_files(self) -> list[pathlib.Path]:
         files: list[pathlib.Path] = []
         # {project}.json
-        backup_path = self.directory.joinpath(f"{_escape_filename(self.project)}.json")
+        backup_path = _backup_path(self.directory, self.project)
         files.append(backup_path)
         # {project}.info.json
         if self._info is not None:
             files.append(backup_path.with_suffix(".info.json"))
         # pages
-        page_directory = self.directory.joinpath("pages")
-        for page in self._backup["pages"]:
-            files.append(
-                page_directory.joinpath(f'{_escape_filename(page["title"])}.json')
-            )
+        files.extend(self._page_path(title) for title in self._pages().keys())
         return files
 
     def save(
@@ -394,7 +417,7 @@ class Backup:
     ) -> None:
         logger = logger or logging.getLogger(__name__)
         # {project}.json
-        backup_path = self.directory.joinpath(f"{_escape_filename(self.project)}.json")
+        backup_path = _backup_path(self.directory, self.project)
         logger.debug(f'save "{backup_path}"')
         save_json(backup_path, self._backup)
         # {project}.info.json
@@ -403,13 +426,29 @@ class Backup:
             logger.debug(f'save "{info_path}"')
             save_json(info_path, self._info)
         # pages
-        page_directory = self.directory.joinpath("pages")
-        for page in self._backup["pages"]:
-            page_path = page_directory.joinpath(
-                f'{_escape_filename(page["title"])}.json'
-            )
+        self.directory.joinpath("pages").mkdir(parents=True, exist_ok=True)
+        pages = self._pages()
+
+        def save_page(title: str) -> None:
+            page_path = self._page_path(title)
             logger.debug(f'save "{page_path}"')
-            save_json(page_path, page)
+            save_json(page_path, pages[title])
+
+        # write pages in parallel
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            # consume the results to raise exceptions in the threads
+            list(executor.map(save_page, pages.keys()))
+
+    def _pages(self) -> dict[str, BackupPageJSON]:
+        # {escaped title: page}, the last page wins if the escaped titles conflict
+        if self._escaped_pages is None:
+            self._escaped_pages = {
+                _escape_filename(page["title"]): page for page in self._backup["pages"]
+            }
+        return self._escaped_pages
+
+    def _page_path(self, escaped_title: str) -> pathlib.Path:
+        return self.directory.joinpath("pages", f"{escaped_title}.json")
 
     @classmethod
     def load(
@@ -422,7 +461,7 @@ class Backup:
     ) -> Optional[Backup]:
         logger = logger or logging.getLogger(__name__)
         # {project}.json
-        backup_path = directory.joinpath(f"{_escape_filename(project)}.json")
+        backup_path = _backup_path(directory, project)
         backup: Optional[BackupJSON] = load_json(
             backup_path, schema=jsonschema_backup()
         )
@@ -445,7 +484,7 @@ class Backup:
         )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class BackupJSONs:
     timestamp: int
     backup_path: pathlib.Path
@@ -454,6 +493,16 @@ class BackupJSONs:
     def load_backup(self) -> Optional[BackupJSON]:
         return load_json(self.backup_path, schema=jsonschema_backup())
 
+    def iter_pages(self) -> Generator[BackupPageJSON, None, None]:
+        # stream pages without loading the whole backup into memory
+        with self.backup_path.open(mode="rb") as file:
+            try:
+                for page in ijson.items(file, "pages.item"):
+                    validate_json(page, jsonschema_backup_page())
+                    yield page
+            except (ijson.JSONError, jsonschema.exceptions.ValidationError) as error:
+                raise BackupLoadError(f'Invalid backup "{self.backup_path}"') from error
+
     def load_info(self) -> Optional[BackupInfoJSON]:
         if self.info_path is None:
             return None
@@ -518,13 +567,11 @@ def _is_sorted_pages(
 
 
 def _escape_filename(text: str) -> str:
-    table: dict[str, int | str | None] = {
-        " ": "_",
-        "#": "%23",
-        "%": "%25",
-        "/": "%2F",
-    }
-    return text.translate(str.maketrans(table))
+    return text.translate(_FILENAME_TRANSLATE)
+
+
+def _backup_path(directory: pathlib.Path, project: str) -> pathlib.Path:
+    return directory.joinpath(f"{_escape_filename(project)}.json")
 
 
 def _normalize_page_title(title: str) -> str:
@@ -533,33 +580,28 @@ def _normalize_page_title(title: str) -> str:
 
 def _filter_code(page: BackupPageJSON) -> Generator[Tuple[str, Location], None, None]:
     title = page["title"]
-    # regex
-    code_block = re.compile(r"(?P<indent>(\t| )*)code:.+")
-    cli_notation = re.compile(r"(\t| )*(\$|%) .+")
-    code_snippets = re.compile(r"`.*?`")
-    indent = re.compile(r"(\t| )*")
     # code block
     code_block_indent_level: Optional[int] = None
     # iterate lines
     for i, line in enumerate(page_lines(page)):
         # in code block
         if code_block_indent_level is not None:
-            indent_match = indent.match(line)
-            indent_level = len(indent_match.group()) if indent_match is not None else 0
+            indent_level = len(line) - len(line.lstrip("\t "))
             # end code block
             if indent_level <= code_block_indent_level:
                 code_block_indent_level = None
             else:
                 continue
         # start code_block
-        if code_block_match := code_block.match(line):
+        if code_block_match := _CODE_BLOCK_RE.match(line):
             code_block_indent_level = len(code_block_match.group("indent"))
             continue
         # CLI notation
-        if cli_notation.match(line):
+        if _CLI_NOTATION_RE.match(line):
             continue
         # code snippets
-        line = code_snippets.sub(" ", line)
+        if "`" in line:
+            line = _CODE_SNIPPETS_RE.sub(" ", line)
         yield line, Location(title=title, line=i)
 
 
@@ -578,22 +620,27 @@ def _search_backup(directory: pathlib.Path) -> list[BackupJSONs]:
     backups: list[BackupJSONs] = []
     # check if the path is directory
     if directory.is_dir():
-        for path in directory.iterdir():
+        # DirEntry caches the file type, so no extra stat() per file
+        with os.scandir(directory) as entries:
+            names = {entry.name: entry.is_file() for entry in entries}
+        for name, is_file in names.items():
             # check if the path is file
-            if not path.is_file():
+            if not is_file:
                 continue
             # check if the filename is '{timestamp}.json'
-            filename_match = re.match(r"^(?P<timestamp>\d+)\.json$", path.name)
-            if filename_match is None:
+            stem = name.removesuffix(".json")
+            if stem == name or not stem.isdecimal():
                 continue
-            timestamp = int(filename_match.group("timestamp"))
+            timestamp = int(stem)
             # info path
-            info_path = directory.joinpath(f"{timestamp}.info.json")
+            info_name = f"{timestamp}.info.json"
             backups.append(
                 BackupJSONs(
                     timestamp=timestamp,
-                    backup_path=path,
-                    info_path=info_path if info_path.exists() else None,
+                    backup_path=directory.joinpath(name),
+                    info_path=(
+                        directory.joinpath(info_name) if info_name in names else None
+                    ),
                 )
             )
     return backups
@@ -604,11 +651,13 @@ def _search_subdirectory(directory: pathlib.Path) -> list[BackupJSONs]:
     backups: list[BackupJSONs] = []
     # check if the path is directory
     if directory.is_dir():
-        for path in directory.iterdir():
-            # check if the path is directory
-            if not path.is_dir():
-                continue
-            # check if the directory name is 'timestamp / 1.0e+7'
-            if re.match(r"[0-9]+", path.name):
-                backups.extend(_search_backup(path))
+        with os.scandir(directory) as entries:
+            subdirectories = [
+                directory.joinpath(entry.name)
+                for entry in entries
+                # check if the directory name is 'timestamp / 1.0e+7'
+                if entry.is_dir() and _TIMESTAMP_DIRECTORY_RE.match(entry.name)
+            ]
+        for path in subdirectories:
+            backups.extend(_search_backup(path))
     return backups
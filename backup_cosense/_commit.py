@@ -7,7 +7,7 @@ from ._config import Config, GitEmptyInitialCommitConfig
 from ._external_link import save_external_links
 from ._git import Commit, CommitTarget, Git
 from ._utility import format_timestamp
-from .exceptions import InitialCommitError
+from .exceptions import BackupLoadError, InitialCommitError
 
 
 def commit_backups(
@@ -220,17 +220,21 @@ def _initial_commit_timestamp(
                 raise InitialCommitError(
                     "Since there is no backup, unable to define timestamp"
                 )
-            # load json
-            backup_data = backup.load_backup()
-            if backup_data is None:
+            # check if the backup exists
+            if not backup.backup_path.exists():
                 raise InitialCommitError(
                     f'Could not load oldest backup "{backup.backup_path}"'
                 )
             # oldest created page
-            timestamp = min(
-                (page["created"] for page in backup_data["pages"]),
-                default=None,
-            )
+            try:
+                timestamp = min(
+                    (page["created"] for page in backup.iter_pages()),
+                    default=None,
+                )
+            except BackupLoadError as error:
+                raise InitialCommitError(
+                    f'Could not load oldest backup "{backup.backup_path}"'
+                ) from error
             if timestamp is None:
                 raise InitialCommitError(
                     "There is no page in oldest backup"
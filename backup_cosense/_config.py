@@ -4,12 +4,12 @@ import functools
 import logging
 import operator
 import pathlib
+import tomllib
 from typing import Any, Callable, Literal, Optional, get_args
 
 import dacite
 import fake_useragent
 import jsonschema
-import toml
 
 from ._backup import BackupStorage, PageOrder
 from ._git import Git
@@ -27,6 +27,7 @@ class CosenseSaveDirectoryConfig:
         )
 
 
+@functools.cache
 def jsonschema_cosense_save_directory_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -42,15 +43,18 @@ def jsonschema_cosense_save_directory_config() -> dict[str, Any]:
 
 @dataclasses.dataclass(frozen=True)
 class CosenseConfig:
+    # pylint: disable=too-many-instance-attributes
     project: str
     session_id: str
     save_directory: CosenseSaveDirectoryConfig
     domain: Literal["scrapbox.io", "cosen.se"] = "scrapbox.io"
+    parallel_limit: int = 1
     request_interval: float = 3.0
     request_timeout: float = 10.0
     backup_start_date: Optional[datetime.datetime] = None
 
 
+@functools.cache
 def jsonschema_cosense_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -68,6 +72,10 @@ def jsonschema_cosense_config() -> dict[str, Any]:
             "domain": {
                 "enum": ["scrapbox.io", "cosen.se"],
             },
+            "parallel_limit": {
+                "type": "integer",
+                "minimum": 1,
+            },
             "request_interval": {
                 "type": "number",
                 "exclusiveMinimum": 0.0,
@@ -90,6 +98,7 @@ class GitEmptyInitialCommitConfig:
     )
 
 
+@functools.cache
 def jsonschema_git_empty_initial_commit_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -136,6 +145,7 @@ class GitConfig:
         )
 
 
+@functools.cache
 def jsonschema_git_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -190,6 +200,7 @@ class FakeUserAgentConfig:
         return generator.random
 
 
+@functools.cache
 def jsonschema_fake_user_agent_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -232,6 +243,7 @@ class ExternalLinkConfig:
     keep_deleted_links: bool = False
 
 
+@functools.cache
 def jsonschema_external_link_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -292,6 +304,7 @@ class Config:
     external_link: ExternalLinkConfig = ExternalLinkConfig()
 
 
+@functools.cache
 def jsonschema_config() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -306,17 +319,30 @@ def jsonschema_config() -> dict[str, Any]:
     return schema
 
 
+# loaded configs: resolved path -> ((mtime, size), config)
+_LOADED_CONFIGS: dict[pathlib.Path, tuple[tuple[int, int], Config]] = {}
+
+
 def load_config(
     path: pathlib.Path,
     *,
     logger: Optional[logging.Logger] = None,
 ) -> Config:
     logger = logger or logging.getLogger(__name__)
-    # load TOML
     logger.info(f'load config from "{path}"')
-    with path.open(encoding="utf-8") as file:
-        loaded = toml.load(file)
-    logger.debug(f"loaded toml: {repr(loaded)}")
+    # reuse the loaded config if the file has not been modified
+    resolved_path = path.resolve()
+    stat = resolved_path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _LOADED_CONFIGS.get(resolved_path)
+    if cached is not None and cached[0] == version:
+        logger.debug("reuse the loaded config")
+        return cached[1]
+    # load TOML
+    with resolved_path.open(mode="rb") as file:
+        loaded = tomllib.load(file)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"loaded toml: {repr(loaded)}")
     # JSON Schema validation
     _validator().validate(instance=loaded)
     # to dataclass
@@ -326,10 +352,13 @@ def load_config(
         data=loaded,
         config=dacite.Config(strict=True),
     )
-    logger.debug(f"config: {repr(config)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"config: {repr(config)}")
+    _LOADED_CONFIGS[resolved_path] = (version, config)
     return config
 
 
+@functools.cache
 def _validator() -> jsonschema.protocols.Validator:
     Validator = jsonschema.Draft202012Validator
     type_checker = Validator.TYPE_CHECKER.redefine_many(
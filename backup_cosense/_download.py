@@ -1,17 +1,14 @@
+import asyncio
+import functools
 import logging
-import time
 from typing import Any, Callable, Optional, TypedDict
 
-import requests
+import aiohttp
+import yarl
 
-from ._backup import (
-    BackupInfoJSON,
-    BackupJSON,
-    jsonschema_backup,
-    jsonschema_backup_info,
-)
+from ._backup import BackupInfoJSON, jsonschema_backup, jsonschema_backup_info
 from ._config import Config
-from ._json import request_json, save_json
+from ._json import parse_json, save_json
 from ._utility import format_timestamp
 
 
@@ -20,6 +17,7 @@ class BackupListJSON(TypedDict):
     backups: list[BackupInfoJSON]
 
 
+@functools.cache
 def jsonschema_backup_list() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -42,17 +40,31 @@ def download_backups(
     logger: Optional[logging.Logger] = None,
 ) -> None:
     logger = logger or logging.getLogger(__name__)
-    with _session(config) as session:
+    asyncio.run(_download_backups(config, logger))
+
+
+async def _download_backups(
+    config: Config,
+    logger: logging.Logger,
+) -> None:
+    async with _session(config) as session:
         # list
-        backup_list = _request_backup_list(config, session, logger)
-        time.sleep(config.cosense.request_interval)
+        backup_list = await _request_backup_list(config, session, logger)
+        await asyncio.sleep(config.cosense.request_interval)
         if not backup_list:
             return
+        # semaphore
+        semaphore = asyncio.Semaphore(config.cosense.parallel_limit)
+
+        # parallel downloads
+        async def _parallel_download(info: BackupInfoJSON) -> None:
+            async with semaphore:
+                await _download_backup(config, session, info, logger)
+                await asyncio.sleep(config.cosense.request_interval)
+
         # backup
-        for info in filter(_backup_filter(config, logger), backup_list):
-            # download
-            _download_backup(config, session, info, logger)
-            time.sleep(config.cosense.request_interval)
+        targets = filter(_backup_filter(config, logger), backup_list)
+        await asyncio.gather(*(_parallel_download(info) for info in targets))
 
 
 def _base_url(config: Config) -> str:
@@ -61,27 +73,63 @@ def _base_url(config: Config) -> str:
     return f"https://{domain}/api/project-backup/{project}"
 
 
-def _session(config: Config) -> requests.Session:
-    session = requests.Session()
+def _session(config: Config) -> aiohttp.ClientSession:
+    # send the session ID only to scrapbox.io & cosen.se
+    cookie_jar = aiohttp.CookieJar()
     domains = ["scrapbox.io", "cosen.se"]
     for domain in domains:
-        session.cookies.set(
-            "connect.sid",
-            config.cosense.session_id,
-            domain=domain,
+        cookie_jar.update_cookies(
+            {"connect.sid": config.cosense.session_id},
+            response_url=yarl.URL(f"https://{domain}"),
         )
-    return session
+    return aiohttp.ClientSession(cookie_jar=cookie_jar)
+
+
+async def _request_bytes(
+    url: str,
+    session: aiohttp.ClientSession,
+    *,
+    timeout: Optional[float] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[bytes]:
+    logger = logger or logging.getLogger(__name__)
+    # request
+    logger.info(f"get request: {url}")
+    async with session.get(
+        url,
+        # timeout for connecting & each read, not the whole response
+        timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout),
+    ) as response:
+        if not response.ok:
+            logger.error(f'failed to get request "{url}"')
+            return None
+        return await response.read()
+
+
+async def _request_json(
+    url: str,
+    session: aiohttp.ClientSession,
+    *,
+    timeout: Optional[float] = None,
+    schema: Optional[dict] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Optional[Any]:
+    body = await _request_bytes(url, session, timeout=timeout, logger=logger)
+    if body is None:
+        return None
+    # jsonschema validation
+    return parse_json(body, schema=schema)
 
 
-def _request_backup_list(
+async def _request_backup_list(
     config: Config,
-    session: requests.Session,
+    session: aiohttp.ClientSession,
     logger: logging.Logger,
 ) -> list[BackupInfoJSON]:
     # request to .../project-backup/list
-    response: Optional[BackupListJSON] = request_json(
+    response: Optional[BackupListJSON] = await _request_json(
         f"{_base_url(config)}/list",
-        session=session,
+        session,
         timeout=config.cosense.request_timeout,
         schema=jsonschema_backup_list(),
         logger=logger,
@@ -143,9 +191,9 @@ def _backup_filter(
     return backup_filter
 
 
-def _download_backup(
+async def _download_backup(
     config: Config,
-    session: requests.Session,
+    session: aiohttp.ClientSession,
     info: BackupInfoJSON,
     logger: logging.Logger,
 ) -> None:
@@ -154,21 +202,23 @@ def _download_backup(
     # request
     logger.info(f"download backup {format_timestamp(timestamp)}")
     url = f'{_base_url(config)}/{info["id"]}.json'
-    backup: Optional[BackupJSON] = request_json(
+    body = await _request_bytes(
         url,
-        session=session,
+        session,
         timeout=config.cosense.request_timeout,
-        schema=jsonschema_backup(),
         logger=logger,
     )
-    if backup is None:
+    if body is None:
         return
+    # JSON Schema validation
+    parse_json(body, schema=jsonschema_backup())
     # save
     storage = config.cosense.save_directory.storage()
-    # save backup
+    # save backup as downloaded
     backup_path = storage.backup_path(timestamp)
     logger.info(f'save "{backup_path}"')
-    save_json(backup_path, backup)
+    backup_path.parent.mkdir(parents=True, exist_ok=True)
+    backup_path.write_bytes(body)
     # save backup info
     info_path = storage.info_path(timestamp)
     logger.info(f'save "{info_path}"')
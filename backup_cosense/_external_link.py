@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import copy
 import dataclasses
+import functools
 import logging
 import pathlib
 import random
@@ -19,13 +20,23 @@ from ._config import ExternalLinkConfig
 from ._git import CommitTarget
 from ._json import load_json, save_json
 
+# regex
+_LOGS_FILE_RE = re.compile(r"external_link_(?P<timestamp>\d+).json")
+_URL_SCHEME_RE = re.compile(r"https?://")
 
-@dataclasses.dataclass
+# chunk size to write response content
+_CHUNK_SIZE = 64 * 1024
+# status codes for servers that do not accept HEAD
+_HEAD_REFUSED_STATUS_CODES = (405, 501)
+
+
+@dataclasses.dataclass(slots=True)
 class ResponseLog:
     status_code: int
     content_type: Optional[str]
 
 
+@functools.cache
 def jsonschema_response_log() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -39,12 +50,13 @@ def jsonschema_response_log() -> dict[str, Any]:
     return schema
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class RequestError:
     error_type: str
     message: str
 
 
+@functools.cache
 def jsonschema_request_error() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -58,7 +70,7 @@ def jsonschema_request_error() -> dict[str, Any]:
     return schema
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ExternalLinkLog:
     url: str
     locations: list[Location]
@@ -71,6 +83,7 @@ class ExternalLinkLog:
         return ExternalLink(url=self.url, locations=self.locations)
 
 
+@functools.cache
 def jsonschema_external_link_log() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -102,6 +115,7 @@ def jsonschema_external_link_log() -> dict[str, Any]:
     return schema
 
 
+@functools.cache
 def jsonschema_external_link_logs() -> dict[str, Any]:
     schema = {
         "type": "array",
@@ -110,12 +124,13 @@ def jsonschema_external_link_logs() -> dict[str, Any]:
     return schema
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class SavedExternalLinksInfo:
     content_types: list[str]
     urls: list[str]
 
 
+@functools.cache
 def jsonschema_saved_external_links_info() -> dict[str, Any]:
     schema = {
         "type": "object",
@@ -243,7 +258,7 @@ def _request_logs(
     return logs
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _LogsFile:
     path: pathlib.Path
     timestamp: int
@@ -288,9 +303,7 @@ class _LogsDirectory:
             if not path.is_file():
                 continue
             # filename match
-            if filename_match := re.match(
-                r"external_link_(?P<timestamp>\d+).json", path.name
-            ):
+            if filename_match := _LOGS_FILE_RE.match(path.name):
                 files.append(
                     _LogsFile(
                         path=path, timestamp=int(filename_match.group("timestamp"))
@@ -360,13 +373,13 @@ class _LogsDirectory:
             self._logger.warning(f"skip clean: keep({keep}) must be >= 0")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _LinkLogPair:
     link: Optional[ExternalLink] = None
     log: Optional[ExternalLinkLog] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _ClassifiedExternalLinks:
     new_links: list[ExternalLink]
     logs: list[ExternalLinkLog]
@@ -407,7 +420,7 @@ def _classify_external_links(
     )
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _SaveDirectory:
     root_directory: pathlib.Path
     links_directory: pathlib.Path = dataclasses.field(init=False)
@@ -417,7 +430,7 @@ class _SaveDirectory:
         self.links_directory = self.root_directory.joinpath(links_directory_name)
 
     def file_path(self, url: str) -> pathlib.Path:
-        return self.links_directory.joinpath(re.sub(r"https?://", "", url))
+        return self.links_directory.joinpath(_URL_SCHEME_RE.sub("", url))
 
     def list_path(self) -> pathlib.Path:
         return self.links_directory.joinpath("list.json")
@@ -433,11 +446,13 @@ async def _request_external_links(
     logger: logging.Logger,
 ) -> list[ExternalLinkLog]:
     # connector
-    connector = aiohttp.TCPConnector(limit_per_host=config.parallel_limit_per_host)
+    connector = aiohttp.TCPConnector(
+        limit=config.parallel_limit,
+        limit_per_host=config.parallel_limit_per_host,
+        ttl_dns_cache=300,
+    )
     # timeout
     timeout = aiohttp.ClientTimeout(total=config.timeout)
-    # semaphore
-    semaphore = asyncio.Semaphore(config.parallel_limit)
     # request config
     request_config = _RequestConfig(
         save_directory=save_directory,
@@ -447,22 +462,22 @@ async def _request_external_links(
         excluded_urls=[re.compile(url) for url in config.excluded_urls],
     )
 
-    # parallel requests
-    async def _parallel_request(
-        session: aiohttp.ClientSession,
-        index: int,
-        link: ExternalLink,
-    ) -> ExternalLinkLog:
-        async with semaphore:
-            response = await _request(
-                session,
-                index,
-                link,
-                request_config,
-                logger,
+    # request workers
+    targets = enumerate(links)
+    logs: list[ExternalLinkLog] = []
+
+    async def _request_worker(session: aiohttp.ClientSession) -> None:
+        for index, link in targets:
+            logs.append(
+                await _request(
+                    session,
+                    index,
+                    link,
+                    request_config,
+                    logger,
+                )
             )
             await asyncio.sleep(config.request_interval)
-            return response
 
     logger.info(f"request {len(links)} links")
 
@@ -471,11 +486,17 @@ async def _request_external_links(
         timeout=timeout,
         headers=_request_headers(config),
     ) as session:
-        tasks = [_parallel_request(session, i, link) for i, link in enumerate(links)]
-        return await asyncio.gather(*tasks)
+        # asyncio.gather raises the first exception of the workers as is
+        await asyncio.gather(
+            *(
+                _request_worker(session)
+                for _ in range(min(config.parallel_limit, len(links)))
+            )
+        )
+    return logs
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class _RequestConfig:
     save_directory: _SaveDirectory
     content_types: list[re.Pattern[str]]
@@ -504,8 +525,26 @@ async def _request(
         )
     # request
     try:
+        # HEAD: check the response without downloading the content
+        response_log = await _request_head(session, index, link.url, logger)
+        if response_log is not None and not (
+            # GET: HEAD is refused or the content is to be saved
+            response_log.status_code in _HEAD_REFUSED_STATUS_CODES
+            or _is_saved_content_type(
+                response_log.content_type,
+                config.content_types,
+            )
+        ):
+            logger.debug(f"request({index}): response={response_log}")
+            return ExternalLinkLog(
+                url=link.url,
+                locations=link.locations,
+                access_timestamp=access_timestamp,
+                response=response_log,
+                is_saved=False,
+            )
         async with session.get(link.url) as response:
-            logger.debug(f"request({index}): status={response.status}")
+            logger.debug(f"request({index}): GET status={response.status}")
             response_log = ResponseLog(
                 status_code=response.status,
                 content_type=response.headers.get("content-type"),
@@ -513,9 +552,9 @@ async def _request(
             logger.debug(f"request({index}): response={response_log}")
             is_saved = False
             # check content type
-            if response_log.content_type is not None and any(
-                content_type.match(response_log.content_type)
-                for content_type in config.content_types
+            if _is_saved_content_type(
+                response_log.content_type,
+                config.content_types,
             ):
                 logger.debug(
                     f"request({index}): save content ({response_log.content_type})"
@@ -526,7 +565,8 @@ async def _request(
                 if not save_path.parent.exists():
                     save_path.parent.mkdir(parents=True)
                 with save_path.open(mode="bw") as file:
-                    file.write(await response.read())
+                    async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                        file.write(chunk)
                 is_saved = True
             return ExternalLinkLog(
                 url=link.url,
@@ -549,6 +589,36 @@ async def _request(
         )
 
 
+async def _request_head(
+    session: aiohttp.ClientSession,
+    index: int,
+    url: str,
+    logger: logging.Logger,
+) -> Optional[ResponseLog]:
+    # return None if the server drops the connection on HEAD
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            logger.debug(f"request({index}): HEAD status={response.status}")
+            return ResponseLog(
+                status_code=response.status,
+                content_type=response.headers.get("content-type"),
+            )
+    except aiohttp.ServerDisconnectedError as error:
+        logger.debug(
+            f"request({index}): HEAD error={error.__class__.__name__}({error})"
+        )
+        return None
+
+
+def _is_saved_content_type(
+    content_type: Optional[str],
+    patterns: list[re.Pattern[str]],
+) -> bool:
+    return content_type is not None and any(
+        pattern.match(content_type) for pattern in patterns
+    )
+
+
 def _request_headers(config: ExternalLinkConfig) -> multidict.CIMultiDict:
     headers: multidict.CIMultiDict = multidict.CIMultiDict()
     # config.user_agent
@@ -10,17 +10,29 @@ import pathlib
 import re
 import shutil
 import subprocess
-import textwrap
-from typing import Iterator, Optional
+import tempfile
+from typing import Iterator, Optional, cast
 
 import jsonschema
 
 from ._backup import BackupInfoJSON, jsonschema_backup_info
-from ._json import parse_json
+from ._json import parse_json, validate_json
 from .exceptions import CommitTargetError, GitNotFoundError
 
+# regex
+_COMMIT_LOG_RE = re.compile(
+    r"hash: (?P<hash>[0-9a-f]{40})\n"
+    r"timestamp: (?P<timestamp>\d+)\n"
+    r"body:\n(?P<body>.*?)\n?$",
+    re.DOTALL,
+)
+_INTEGER_RE = re.compile(r"-?(0|[1-9][0-9]*)")
 
-@dataclasses.dataclass
+# buffer size to read stdout of git command
+_READ_SIZE = 64 * 1024
+
+
+@dataclasses.dataclass(slots=True)
 class Commit:
     hash: str
     timestamp: int
@@ -33,15 +45,23 @@ class Commit:
         # check if the body is empty
         if not self.body:
             return None
-        # parse as JSON
-        body = "{" + ",".join(self.body.split("\n")) + "}"
+        # parse '"key": value' lines
+        info: dict[str, str | int] = {}
+        for line in self.body.split("\n"):
+            key, separator, value = line.partition(": ")
+            if not separator:
+                return None
+            parsed_key = _parse_commit_body_value(key)
+            parsed_value = _parse_commit_body_value(value)
+            if not isinstance(parsed_key, str) or parsed_value is None:
+                return None
+            info[parsed_key] = parsed_value
+        # JSON Schema validation
         try:
-            info = parse_json(body, schema=jsonschema_backup_info())
-        except json.decoder.JSONDecodeError:
-            return None
+            validate_json(info, jsonschema_backup_info())
         except jsonschema.exceptions.ValidationError:
             return None
-        return info
+        return cast(BackupInfoJSON, info)
 
     @staticmethod
     def message(
@@ -55,12 +75,9 @@ class Commit:
         body: list[str] = []
         if info is not None:
             body.extend(
-                line.removesuffix(",")
-                for line in textwrap.dedent(
-                    json.dumps(info, ensure_ascii=False, indent=2)
-                    .removeprefix("{\n")
-                    .removesuffix("\n}")
-                ).split("\n")
+                f"{json.dumps(key, ensure_ascii=False)}:"
+                f" {json.dumps(value, ensure_ascii=False)}"
+                for key, value in info.items()
             )
         # message
         if not body:
@@ -186,12 +203,7 @@ class Git:
         ignore_error: bool = False,
         env: Optional[dict[str, str]] = None,
     ) -> subprocess.CompletedProcess:
-        self._logger.debug(f"command: {command}")
-        # check if the repository exists
-        if not self.exists():
-            self._logger.error(f'git repository "{self.path}" does not exist')
-        # switch branch
-        self.switch()
+        self._prepare_command(command)
         # execute command
         return _execute_git_command(
             command,
@@ -201,6 +213,29 @@ class Git:
             env=env,
         )
 
+    def execute_records(
+        self,
+        command: list[str],
+        *,
+        separator: bytes = b"\0",
+    ) -> Iterator[str]:
+        self._prepare_command(command)
+        # execute command
+        yield from _iter_git_command_records(
+            command,
+            self.path,
+            separator=separator,
+            logger=self._logger,
+        )
+
+    def _prepare_command(self, command: list[str]) -> None:
+        self._logger.debug(f"command: {command}")
+        # check if the repository exists
+        if not self.exists():
+            self._logger.error(f'git repository "{self.path}" does not exist')
+        # switch branch
+        self.switch()
+
     def branches(self) -> list[str]:
         try:
             process = _execute_git_command(
@@ -290,17 +325,17 @@ class Git:
         command = [self._executable, "log", "-z", f"--format={log_format}"]
         if option is not None:
             command.extend(option)
-        process = self.execute(command)
         # parse
         commits: list[Commit] = []
-        for log in process.stdout.split("\0"):
+        for log in self.execute_records(command):
             # skip empty log
             if not log:
                 continue
             # parse log as commit
             commit = _log_to_commit(log)
             if commit is not None:
-                self._logger.debug(f"commit: {repr(commit)}")
+                if self._logger.isEnabledFor(logging.DEBUG):
+                    self._logger.debug(f"commit: {repr(commit)}")
                 commits.append(commit)
             else:
                 self._logger.warning(f'failed to parse commit "{repr(log)}"')
@@ -353,20 +388,65 @@ def _execute_git_command(
             stderr=subprocess.PIPE,
         )
     except subprocess.CalledProcessError as error:
-        error_info = {
-            "return_code": error.returncode,
-            "command": error.cmd,
-            "stdout": error.stdout,
-            "stderr": error.stderr,
-        }
-        if ignore_error:
-            logger.debug(f"{error.__class__.__name__}: {error_info}")
-        else:
-            logger.error(f"{error.__class__.__name__}: {error_info}")
+        _log_git_error(error, logger=logger, ignore_error=ignore_error)
         raise error
     return process
 
 
+def _iter_git_command_records(
+    command: list[str],
+    repository: pathlib.Path,
+    *,
+    separator: bytes,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[str]:
+    logger = logger or logging.getLogger(__name__)
+    # stderr is written to a temporary file so that git never blocks on it
+    with tempfile.TemporaryFile() as stderr_file, subprocess.Popen(
+        command,
+        cwd=repository,
+        stdout=subprocess.PIPE,
+        stderr=stderr_file,
+    ) as process:
+        assert process.stdout is not None
+        # split stdout into records as it arrives
+        rest = b""
+        while chunk := process.stdout.read(_READ_SIZE):
+            *records, rest = (rest + chunk).split(separator)
+            for record in records:
+                yield record.decode("utf-8")
+        if rest:
+            yield rest.decode("utf-8")
+        return_code = process.wait()
+        if return_code != 0:
+            stderr_file.seek(0)
+            error = subprocess.CalledProcessError(
+                return_code,
+                command,
+                stderr=stderr_file.read().decode("utf-8"),
+            )
+            _log_git_error(error, logger=logger)
+            raise error
+
+
+def _log_git_error(
+    error: subprocess.CalledProcessError,
+    *,
+    logger: logging.Logger,
+    ignore_error: bool = False,
+) -> None:
+    error_info = {
+        "return_code": error.returncode,
+        "command": error.cmd,
+        "stdout": error.stdout,
+        "stderr": error.stderr,
+    }
+    if ignore_error:
+        logger.debug(f"{error.__class__.__name__}: {error_info}")
+    else:
+        logger.error(f"{error.__class__.__name__}: {error_info}")
+
+
 def _into_steps(
     paths: set[pathlib.Path],
     step_size: int,
@@ -381,14 +461,26 @@ def _into_steps(
         yield chunk
 
 
+def _parse_commit_body_value(value: str) -> Optional[str | int]:
+    # string
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        text = value[1:-1]
+        if '"' not in text and "\\" not in text:
+            return text
+        # decode escape sequences
+        try:
+            parsed = parse_json(value)
+        except json.decoder.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, str) else None
+    # integer
+    if _INTEGER_RE.fullmatch(value):
+        return int(value)
+    return None
+
+
 def _log_to_commit(log: str) -> Optional[Commit]:
-    commit_match = re.match(
-        r"hash: (?P<hash>[0-9a-f]{40})\n"
-        r"timestamp: (?P<timestamp>\d+)\n"
-        r"body:\n(?P<body>.*?)\n?$",
-        log,
-        re.DOTALL,
-    )
+    commit_match = _COMMIT_LOG_RE.match(log)
     if commit_match is None:
         return None
     return Commit(
@@ -1,22 +1,40 @@
-import contextlib
-import json
-import logging
 import pathlib
-from typing import Any, Iterator, Optional
+from typing import Any, Callable, Optional
 
+import fastjsonschema
 import jsonschema
-import requests
+import orjson
+
+# validators compiled from the schema, keyed by id(schema)
+_VALIDATORS: dict[int, jsonschema.protocols.Validator] = {}
+_FAST_VALIDATORS: dict[int, Callable[[Any], Any]] = {}
+
+
+def validate_json(instance: Any, schema: dict) -> None:
+    validator = _VALIDATORS.get(id(schema))
+    if validator is None:
+        # check the schema only once
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        _VALIDATORS[id(schema)] = validator
+        _FAST_VALIDATORS[id(schema)] = fastjsonschema.compile(schema)
+    try:
+        _FAST_VALIDATORS[id(schema)](instance)
+    except fastjsonschema.JsonSchemaValueException:
+        # report the error by jsonschema
+        validator.validate(instance)
 
 
 def parse_json(
-    text: str,
+    text: str | bytes,
     *,
     schema: Optional[dict] = None,
 ) -> Optional[Any]:
-    value = json.loads(text)
+    value = orjson.loads(text)
     # JSON Schema validation
     if schema is not None:
-        jsonschema.validate(instance=value, schema=schema)
+        validate_json(value, schema)
     return value
 
 
@@ -27,11 +45,10 @@ def load_json(
 ) -> Optional[Any]:
     if not path.exists():
         return None
-    with path.open(encoding="utf-8") as file:
-        value = json.load(file)
+    value = orjson.loads(path.read_bytes())
     # JSON Schema validation
     if schema is not None:
-        jsonschema.validate(instance=value, schema=schema)
+        validate_json(value, schema)
     return value
 
 
@@ -40,54 +57,14 @@ def save_json(
     data: Any,
     *,
     schema: Optional[dict] = None,
-    indent: Optional[int] = 2,
+    indent: bool = True,
 ) -> None:
     # JSON Schema validation
     if schema is not None:
-        jsonschema.validate(instance=data, schema=schema)
+        validate_json(data, schema)
     if not path.parent.exists():
-        path.parent.mkdir(parents=True)
-    with path.open(mode="w", encoding="utf-8") as file:
-        json.dump(
-            data,
-            file,
-            ensure_ascii=False,
-            indent=indent,
-        )
-        file.write("\n")
-
-
-@contextlib.contextmanager
-def with_session(session: Optional[requests.Session]) -> Iterator[requests.Session]:
-    try:
-        if session is None:
-            temp_session = requests.Session()
-            yield temp_session
-        else:
-            yield session
-    finally:
-        if session is None:
-            temp_session.close()
-
-
-def request_json(
-    url: str,
-    *,
-    session: Optional[requests.Session] = None,
-    timeout: Optional[float] = None,
-    schema: Optional[dict] = None,
-    logger: Optional[logging.Logger] = None,
-) -> Optional[Any]:
-    logger = logger or logging.getLogger(__name__)
-    # request
-    logger.info(f"get request: {url}")
-    with with_session(session) as session_:
-        response = session_.get(url, timeout=timeout)
-        if not response.ok:
-            logger.error(f'failed to get request "{url}"')
-            return None
-    # jsonschema validation
-    value = json.loads(response.text)
-    if schema is not None:
-        jsonschema.validate(instance=value, schema=schema)
-    return value
+        path.parent.mkdir(parents=True, exist_ok=True)
+    option = orjson.OPT_APPEND_NEWLINE
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    path.write_bytes(orjson.dumps(data, option=option))
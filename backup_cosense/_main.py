@@ -1,12 +1,24 @@
+from __future__ import annotations
+
 import argparse
+import functools
 import logging
 import pathlib
-from typing import Optional
+import sys
+from typing import TYPE_CHECKING
+
+from ._config import CosenseSaveDirectoryConfig, load_config
+
+if TYPE_CHECKING:
+    from typing import Callable, Iterator, Optional
 
-from ._commit import commit_backups
-from ._config import Config, CosenseSaveDirectoryConfig, load_config
-from ._download import download_backups
-from ._export import export_backups
+    from ._config import Config
+
+# default config file
+_DEFAULT_CONFIG = "config.toml"
+
+# log formatter of the default logger
+_FORMATTER = logging.Formatter(fmt="%(asctime)s %(name)s:%(levelname)s:%(message)s")
 
 
 def backup_cosense(
@@ -19,40 +31,82 @@ def backup_cosense(
     if logger is None:
         logger = logging.getLogger("backup-cosense")
         logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        handler.formatter = logging.Formatter(
-            fmt="%(asctime)s %(name)s:%(levelname)s:%(message)s"
-        )
-        logger.addHandler(handler)
+        # add the handler only once
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.formatter = _FORMATTER
+            logger.addHandler(handler)
     # option
-    option = _argument_parser().parse_args(args=args)
+    arguments = args if args is not None else sys.argv[1:]
+    option = _parse_arguments(arguments)
+    if option is None:
+        command = _find_command(arguments)
+        option = _argument_parser(command).parse_args(args=arguments)
+    # intern the command to look up the command table by identity
+    if option.command is not None:
+        option.command = sys.intern(option.command)
     if option.verbose:
         logger.setLevel(logging.DEBUG)
-    logger.debug(f"option: {option}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"option: {option}")
     # config TOML
     if config is None:
-        config = load_config(option.config, logger=logger)
+        config = load_config(pathlib.Path(option.config), logger=logger)
     # main
-    logger.info("backup-cosense")
-    # download backup
-    if option.command in (None, "download"):
-        logger.info("command: download")
-        download_backups(config, logger=logger)
-    # commit
-    if option.command in (None, "commit"):
-        logger.info("command: commit")
-        commit_backups(config, logger=logger)
-    # export
-    if option.command == "export":
-        logger.info("command: export")
-        destination = CosenseSaveDirectoryConfig(
-            name=option.destination,
-            subdirectory=option.subdirectory,
-        ).storage()
-        export_backups(config, destination, logger=logger)
+    _COMMANDS[option.command](config, option, logger)
+
+
+def _run_download(
+    config: Config,
+    option: argparse.Namespace,  # pylint: disable=unused-argument
+    logger: logging.Logger,
+) -> None:
+    logger.info("backup-cosense command: download")
+    # pylint: disable-next=import-outside-toplevel
+    from ._download import download_backups
+
+    download_backups(config, logger=logger)
+
+
+def _run_commit(
+    config: Config,
+    option: argparse.Namespace,  # pylint: disable=unused-argument
+    logger: logging.Logger,
+) -> None:
+    logger.info("backup-cosense command: commit")
+    # pylint: disable-next=import-outside-toplevel
+    from ._commit import commit_backups
+
+    commit_backups(config, logger=logger)
+
+
+def _run_export(
+    config: Config,
+    option: argparse.Namespace,
+    logger: logging.Logger,
+) -> None:
+    logger.info("backup-cosense command: export")
+    # pylint: disable-next=import-outside-toplevel
+    from ._export import export_backups
+
+    destination = CosenseSaveDirectoryConfig(
+        name=option.destination,
+        subdirectory=option.subdirectory,
+    ).storage()
+    export_backups(config, destination, logger=logger)
+
+
+def _run_download_and_commit(
+    config: Config,
+    option: argparse.Namespace,
+    logger: logging.Logger,
+) -> None:
+    _run_download(config, option, logger)
+    _run_commit(config, option, logger)
 
 
-def _argument_parser() -> argparse.ArgumentParser:
+@functools.cache
+def _argument_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog=__package__)
     _add_common_arguments(parser)
     # sub parser
@@ -64,23 +118,110 @@ def _argument_parser() -> argparse.ArgumentParser:
             "(if not specified, download and commit are executed)"
         ),
     )
-    # download
+    # build only the sub parser of the command (all sub parsers otherwise)
+    if command in _SUB_PARSERS:
+        # list all commands in the usage
+        sub_parsers.metavar = "{" + ",".join(_SUB_PARSERS) + "}"
+        _SUB_PARSERS[command](sub_parsers)
+    else:
+        for add_sub_parser in _SUB_PARSERS.values():
+            add_sub_parser(sub_parsers)
+    return parser
+
+
+def _parse_arguments(args: list[str]) -> Optional[argparse.Namespace]:
+    # parse the common forms of arguments without argparse
+    # return None if argparse is required (e.g. help, errors)
+    option = argparse.Namespace(
+        config=_DEFAULT_CONFIG,
+        verbose=False,
+        command=None,
+    )
+    arguments = iter(args)
+    # common arguments
+    for argument in arguments:
+        if argument in ("-v", "--verbose"):
+            option.verbose = True
+        elif argument.partition("=")[0] == "--config":
+            value = _option_value(argument, arguments)
+            if value is None:
+                return None
+            option.config = value
+        elif argument in _SUB_PARSERS:
+            option.command = argument
+            break
+        else:
+            return None
+    # export arguments
+    if option.command == "export":
+        return option if _parse_export_arguments(option, arguments) else None
+    # download & commit take no arguments
+    if next(arguments, None) is not None:
+        return None
+    return option
+
+
+def _parse_export_arguments(
+    option: argparse.Namespace,
+    arguments: Iterator[str],
+) -> bool:
+    option.destination = None
+    option.subdirectory = False
+    for argument in arguments:
+        if argument == "--subdirectory":
+            option.subdirectory = True
+        elif argument == "-d" or argument.partition("=")[0] == "--destination":
+            option.destination = _option_value(argument, arguments)
+            if option.destination is None:
+                return False
+        else:
+            return False
+    return option.destination is not None
+
+
+def _option_value(argument: str, arguments: Iterator[str]) -> Optional[str]:
+    # "--option=value" or "--option value"
+    _, separator, value = argument.partition("=")
+    if not separator:
+        value = next(arguments, "-")
+    if value.startswith("-"):
+        return None
+    return value
+
+
+def _find_command(args: list[str]) -> Optional[str]:
+    # the command if only --config and --verbose precede it
+    # (None for help, abbreviated options, unknown commands...,
+    #  so that the full parser handles them)
+    arguments = iter(args)
+    for argument in arguments:
+        if argument == "--config":
+            next(arguments, None)
+        elif not (argument in ("-v", "--verbose") or argument.startswith("--config=")):
+            return argument if argument in _SUB_PARSERS else None
+    return None
+
+
+def _add_download_parser(sub_parsers: argparse._SubParsersAction) -> None:
     sub_parsers.add_parser(
         "download",
         help="download backup from scrapbox.io",
     )
-    # commit
+
+
+def _add_commit_parser(sub_parsers: argparse._SubParsersAction) -> None:
     sub_parsers.add_parser(
         "commit",
         help="commit to Git repository",
     )
-    # export
+
+
+def _add_export_parser(sub_parsers: argparse._SubParsersAction) -> None:
     export_parser = sub_parsers.add_parser(
         "export",
         help="export backups from Git repository",
     )
     _add_export_arguments(export_parser)
-    return parser
 
 
 def _add_common_arguments(parser: argparse.ArgumentParser) -> None:
@@ -88,10 +229,9 @@ def _add_common_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--config",
         dest="config",
-        default="config.toml",
+        default=_DEFAULT_CONFIG,
         metavar="TOML",
-        type=pathlib.Path,
-        help=".toml file (default %(default)s)",
+        help=f".toml file (default {_DEFAULT_CONFIG})",
     )
     # verbose
     parser.add_argument(
@@ -120,3 +260,22 @@ def _add_export_arguments(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="create subdirectories on export",
     )
+
+
+# sub parsers of each command
+_SUB_PARSERS: dict[str, Callable[[argparse._SubParsersAction], None]] = {
+    "download": _add_download_parser,
+    "commit": _add_commit_parser,
+    "export": _add_export_parser,
+}
+
+# command runners (download and commit if the command is not specified)
+_COMMANDS: dict[
+    Optional[str],
+    Callable[[Config, argparse.Namespace, logging.Logger], None],
+] = {
+    None: _run_download_and_commit,
+    "download": _run_download,
+    "commit": _run_commit,
+    "export": _run_export,
+}
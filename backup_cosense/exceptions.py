@@ -1,3 +1,7 @@
+class BackupLoadError(Exception):
+    pass
+
+
 class CommitTargetError(Exception):
     pass
 